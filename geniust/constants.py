@@ -1,6 +1,6 @@
 import os
 from collections import namedtuple
-from typing import List, Optional
+from typing import FrozenSet, List, Optional
 
 from telegram.ext import ConversationHandler
 
@@ -30,20 +30,22 @@ TELETHON_SESSION_STRING: str = os.environ["TELETHON_SESSION_STRING"]
 RECOMMENDER_TOKEN: str = os.environ["RECOMMENDER_TOKEN"]
 BTC_ADDRESS: str = os.environ["BTC_ADDRESS"]
 
-TELEGRAM_HTML_TAGS: List[str] = [
-    "b",
-    "strong",
-    "i",
-    "em",
-    "u",
-    "ins",
-    "s",
-    "strike",
-    "del",
-    "a",
-    "code",
-    "pre",
-]
+TELEGRAM_HTML_TAGS: FrozenSet[str] = frozenset(
+    [
+        "b",
+        "strong",
+        "i",
+        "em",
+        "u",
+        "ins",
+        "s",
+        "strike",
+        "del",
+        "a",
+        "code",
+        "pre",
+    ]
+)
 
 
 Preferences = namedtuple("Preferences", "genres, artists", defaults=[[]])
@@ -13,17 +13,37 @@ logger = logging.getLogger("geniust")
 Base = declarative_base()
 RT = TypeVar("RT")
 
+# Connection pool settings for the production database.
+# Handlers run in PTB's worker threads, so the pool should be big enough
+# to give each worker a warm connection instead of opening a new one.
+POOL_SIZE = 10
+POOL_MAX_OVERFLOW = 5
+# Platforms that users can have a token for.
+TOKEN_PLATFORMS = ("genius", "spotify")
+
 
 def init_db(db_uri: str) -> scoped_session:
     """initializes db using db_uri
 
+    Connections are kept in a pool and reused across sessions,
+    so queries don't pay for a new connection (and SSL handshake)
+    each time. Connections the server has dropped are detected
+    and replaced when they're checked out of the pool.
+
     Args:
         db_uri (str): URI of database.
 
     Returns:
         scoped_session: Session factory.
     """
-    engine = create_engine(db_uri)
+    engine_options: Dict[str, Any] = {}
+    if not db_uri.startswith("sqlite"):
+        engine_options.update(
+            pool_size=POOL_SIZE,
+            max_overflow=POOL_MAX_OVERFLOW,
+            pool_pre_ping=True,
+        )
+    engine = create_engine(db_uri, **engine_options)
     Base.metadata.create_all(engine)
     return scoped_session(sessionmaker(bind=engine, expire_on_commit=False))
 
@@ -152,6 +172,26 @@ class Preferences(Base):
         )
 
 
+def token_column(platform: str) -> Column:
+    """Returns the token column of platform
+
+    The column name is built from user input, so it's checked
+    against the known platforms instead of being passed to the query as is.
+
+    Args:
+        platform (str): Platform of the token (e.g. genius).
+
+    Raises:
+        ValueError: If platform isn't supported.
+
+    Returns:
+        Column: Token column.
+    """
+    if platform not in TOKEN_PLATFORMS:
+        raise ValueError(f"Unknown token platform: {platform}")
+    return getattr(Users, f"{platform}_token")
+
+
 class Database:
     """Database class for all communications with the database."""
 
@@ -173,7 +213,8 @@ class Database:
         """
         user = session.get(Users, chat_id)
         if user:
-            preferences = self.get_preferences(chat_id)
+            # use the same session instead of checking out another connection
+            preferences = session.get(Preferences, chat_id)
         else:
             # create user data with default preferences
             user = Users(
@@ -247,7 +288,7 @@ class Database:
             data (str): Genius user token.
             platform (str): Platform token to update (e.g. genius).
         """
-        column = f"{platform}_token"
+        column = token_column(platform)
         session.query(Users).filter(Users.chat_id == chat_id).update(
             {column: data}, synchronize_session=False
         )
@@ -260,7 +301,7 @@ class Database:
             chat_id (int): Chat ID.
             platform (str): Platform token to delete (e.g. genius).
         """
-        column = f"{platform}_token"
+        column = token_column(platform)
         session.query(Users).filter(Users.chat_id == chat_id).update(
             {column: None}, synchronize_session=False
         )
@@ -276,12 +317,8 @@ class Database:
         Returns:
             str: Genius user token.
         """
-        column = f"{platform}_token"
-        return (
-            session.query(getattr(Users, column))
-            .filter(Users.chat_id == chat_id)
-            .one()[0]
-        )
+        column = token_column(platform)
+        return session.query(column).filter(Users.chat_id == chat_id).one()[0]
 
     @get_session
     def get_tokens(self, chat_id: int, session=None) -> Dict[str, Optional[str]]:
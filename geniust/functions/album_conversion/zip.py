@@ -6,6 +6,11 @@ from zipfile import ZIP_DEFLATED, ZipFile
 
 from geniust import utils
 
+# Artist name before the song title (e.g. Artist - Title)
+TITLE_ARTIST = re.compile(r".*[\s]*-\s*")
+# Non-ASCII phrase in parentheses at the end of the title
+TITLE_PARENTHESES = re.compile(r"[\s][\(\[][^\x00-\x7F]+.*[\)\]]")
+
 
 def create_zip(album: Dict[str, Any], user_data: Dict[str, Any]) -> BytesIO:
     """Creates zipped album
@@ -21,7 +26,6 @@ def create_zip(album: Dict[str, Any], user_data: Dict[str, Any]) -> BytesIO:
         BytesIO: ZIP file seeked to the 0 position.
     """
     bio = BytesIO()
-    zip_file = ZipFile(bio, "a", compression=ZIP_DEFLATED)
 
     # put user_data in variables
     lyrics_language = user_data["lyrics_lang"]
@@ -35,35 +39,37 @@ def create_zip(album: Dict[str, Any], user_data: Dict[str, Any]) -> BytesIO:
     full_title = utils.format_filename(full_title)
     bio.name = f"{full_title}.zip"
 
-    # Save the songs as text
-    for track in album["tracks"]:
-        song = track["song"]
-        number = track["number"]
-        lyrics = song["lyrics"]
-
-        # format annotations
-        lyrics = utils.format_annotations(
-            lyrics, song["annotations"], include_annotations, identifiers
-        )
-
-        # formatting lyrics language
-        lyrics = utils.format_language(lyrics, lyrics_language)
-
-        # newlines in text files inside zip files need to be
-        # \r\n on Windows
-        lyrics = lyrics.get_text().replace("\n", "\r\n")  # type: ignore
-
-        # cleaning title name
-        title = song["title"]
-        title = re.sub(r".*[\s]*-\s*", "", title)
-        title = re.sub(r"[\s][\(\[][^\x00-\x7F]+.*[\)\]]", "", title)
-        title = utils.format_filename(title)
-
-        # create lyrics file
-        file_name = f"{number:02d} - {title}.txt"
-        zip_file.writestr(file_name, lyrics)
+    # Lyrics are small text files, so the lowest compression level
+    # gives almost the same size as the default one in much less time.
+    with ZipFile(bio, "w", compression=ZIP_DEFLATED, compresslevel=1) as zip_file:
+        # Save the songs as text
+        for track in album["tracks"]:
+            song = track["song"]
+            number = track["number"]
+            lyrics = song["lyrics"]
+
+            # format annotations
+            lyrics = utils.format_annotations(
+                lyrics, song["annotations"], include_annotations, identifiers
+            )
+
+            # formatting lyrics language
+            lyrics = utils.format_language(lyrics, lyrics_language)
+
+            # newlines in text files inside zip files need to be
+            # \r\n on Windows
+            data = lyrics.get_text().encode("utf-8").replace(b"\n", b"\r\n")
+
+            # cleaning title name
+            title = song["title"]
+            title = TITLE_ARTIST.sub("", title)
+            title = TITLE_PARENTHESES.sub("", title)
+            title = utils.format_filename(title)
+
+            # create lyrics file
+            file_name = f"{number:02d} - {title}.txt"
+            zip_file.writestr(file_name, data)
 
-    zip_file.close()
     bio.seek(0)
     return bio
 
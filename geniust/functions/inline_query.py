@@ -2,7 +2,7 @@ import logging
 from typing import Any, Dict, List
 from uuid import uuid4
 
-import Levenshtein
+from rapidfuzz import fuzz
 from telegram import InlineKeyboardButton as IButton
 from telegram import InlineKeyboardMarkup as IBKeyboard
 from telegram import (
@@ -519,7 +519,7 @@ def lyric_card(update: Update, context: CallbackContext) -> None:
     for hit in res["sections"][0]["hits"]:
         highlight = hit["highlights"][0]
         for line in highlight["value"].split("\n"):
-            if Levenshtein.ratio(input_text, line) > 0.5:
+            if fuzz.ratio(input_text, line) > 50:
                 found_lyrics.append(line)
         if found_lyrics:
             break
@@ -4,8 +4,8 @@ from io import BytesIO
 from typing import cast
 from uuid import uuid4
 
-import Levenshtein
 from lyricsgenius.utils import clean_str
+from rapidfuzz import fuzz
 from telegram import ReplyKeyboardMarkup, ReplyKeyboardRemove, Update
 from telegram.ext import CallbackContext
 
@@ -54,10 +54,7 @@ def search_lyrics(update: Update, context: CallbackContext) -> int:
     for hit in json_search["sections"][0]["hits"][:10]:
         highlight = hit["highlights"][0]
         for line in highlight["value"].split("\n"):
-            if (
-                cleaned_input in clean_str(line)
-                or Levenshtein.ratio(input_text, line) > 0.5
-            ):
+            if cleaned_input in clean_str(line) or fuzz.ratio(input_text, line) > 50:
                 found_lyrics.append(line)
         if found_lyrics:
             break
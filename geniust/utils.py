@@ -1,12 +1,24 @@
+import html
 import logging
 import re
-from functools import wraps
-from typing import Any, Callable, Dict, List, Optional, Pattern, Tuple, TypeVar, Union
+from functools import lru_cache, wraps
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Pattern,
+    Tuple,
+    TypeVar,
+    Union,
+)
 
-import Levenshtein
 from bs4 import BeautifulSoup, Comment, NavigableString
 from bs4.element import Tag
 from lyricsgenius.utils import clean_str
+from rapidfuzz import fuzz, process
 from telegram.utils.helpers import create_deep_linked_url
 
 import geniust
@@ -48,6 +60,12 @@ TRANSLATION_PARENTHESES = re.compile(r"\([\u0600-\u06FF]\)")
 SECTION_HEADERS = re.compile(r"\n{0,1}\[.*?\]\n{0,1}")
 FIX_SECTION_HEADERS = re.compile(r"(?<!\n)\n\[")
 
+# HTML tags (used to get the text of lyrics without parsing them)
+HTML_TAGS = re.compile(r"<[^>]+>")
+
+# Characters that aren't allowed in file names
+INVALID_FILENAME_CHARACTERS = re.compile(r"[\\/:*?\"<>|]")
+
 # The keys are Telethon message entity types and the values PTB ones.
 MESSAGE_ENTITY_TYPES = {
     "MessageEntityBold": "bold",
@@ -97,36 +115,54 @@ def deep_link(
         str: Deep linked entity
             (e.g. <a href="link">song name</name>)
     """
+    return _deep_link(name, id, type, platform, download, geniust.username)
+
+
+@lru_cache(maxsize=4096)
+def _deep_link(
+    name: str,
+    id: str,
+    type: str,
+    platform: str,
+    download: bool,
+    username: str,
+) -> str:
+    """Cached implementation of deep_link.
+
+    The bot's username is passed explicitly so that it's a part of the cache key.
+    """
     url = create_deep_linked_url(
-        geniust.username, f"{type}_{id}_{platform}{'_download' if download else ''}"
+        username, f"{type}_{id}_{platform}{'_download' if download else ''}"
     )
     return f"""<a href="{url}">{name}</a>"""
 
 
 def remove_unsupported_tags(
-    soup: BeautifulSoup, supported: List[str] = TELEGRAM_HTML_TAGS
+    soup: BeautifulSoup, supported: Iterable[str] = TELEGRAM_HTML_TAGS
 ) -> BeautifulSoup:
     """Removes unsupported tag from BeautifulSoup object.
 
     Args:
         soup (BeautifulSoup): BeautifulSoup object.
-        supported (Optional[List[str]], optional): List of supported tags to keep.
+        supported (Iterable[str], optional): Supported tags to keep.
         Defaults to TELEGRAM_HTML_TAGS.
 
     Returns:
         BeautifulSoup
     """
-    restart = True
-    while restart:
-        restart = False
-        for tag in soup:
-            name = tag.name
-            if name is not None and name not in supported:
-                if tag.text:
-                    tag.unwrap()
+    supported = frozenset(supported)
+    # Children of unwrapped tags take their place in soup,
+    # so they're checked too instead of restarting the loop.
+    tags = list(soup.contents)
+    while tags:
+        tag = tags.pop()
+        name = tag.name
+        if name is not None and name not in supported:
+            if tag.text:
+                tags.extend(tag.contents)
+                tag.unwrap()
+            else:
                 tag.decompose()
-                restart = True
-                break
 
     return soup
 
@@ -172,7 +208,8 @@ def extract_lyrics_for_card(html_lyrics: str) -> str:
     Returns:
         str: Lyrics with removed section headers.
     """
-    lyrics = BeautifulSoup(html_lyrics, "html.parser").get_text().strip()
+    # Only the text is needed, so there's no need to parse the HTML.
+    lyrics = html.unescape(HTML_TAGS.sub("", html_lyrics)).strip()
     lyrics = fix_section_headers(lyrics)
     return SECTION_HEADERS.sub("", lyrics)
 
@@ -188,17 +225,22 @@ def find_matching_lyrics(lines: List[str], lyrics: str) -> Optional[str]:
         Optional[str]: Matching lyrics if there are any. Otherwise None.
     """
     matching_lyrics = []
+    cleaned_lines = [clean_str(found_line) for found_line in lines]
     for line in lyrics.split("\n"):
-        for found_line in lines:
-            # We'd expect the match between the lines in the snippet (found_lyrics)
-            # and the corresponding lines in the full lyrics to be 100%, but since
-            # Genius implements some methods to detect plagiarism and
-            # these methods modify the lyrics, a 100% similarity ratio might not happen.
-            if Levenshtein.ratio(found_line, line) > 0.75 or clean_str(
-                found_line
-            ) in clean_str(line):
-                matching_lyrics.append(line)
-                break
+        # We'd expect the match between the lines in the snippet (found_lyrics)
+        # and the corresponding lines in the full lyrics to be 100%, but since
+        # Genius implements some methods to detect plagiarism and
+        # these methods modify the lyrics, a 100% similarity ratio might not happen.
+        # extractOne compares the line with all the lines in one call,
+        # and the cutoff lets it skip lines whose length is too different.
+        match = process.extractOne(
+            line, lines, scorer=fuzz.ratio, processor=None, score_cutoff=75
+        )
+        cleaned_line = clean_str(line)
+        if (match and match[1] > 75) or any(
+            found_line in cleaned_line for found_line in cleaned_lines
+        ):
+            matching_lyrics.append(line)
         if len(matching_lyrics) == len(lines):
             break
     return "\n".join(matching_lyrics) if matching_lyrics else None
@@ -237,7 +279,9 @@ def format_language(
     """
 
     def string_formatter(s: str) -> str:
-        if lyrics_language == "English":
+        # ASCII strings have no non-English lines to remove,
+        # and str.isascii() doesn't need to scan the string.
+        if lyrics_language == "English" and not s.isascii():
             s = remove_non_english.sub("\\1", s, 0)
         elif lyrics_language == "Non-English":
             s = remove_english.sub("\\1", s, 0)
@@ -256,8 +300,11 @@ def format_language(
         ]
 
         for string in strings:
-            formatted = string_formatter(str(string))
-            string.replace_with(formatted)
+            original = str(string)
+            formatted = string_formatter(original)
+            # most strings stay the same, so avoid mutating the tree for them
+            if formatted != original:
+                string.replace_with(formatted)
     elif isinstance(lyrics, str):
         lyrics = BeautifulSoup(string_formatter(lyrics), "html.parser")
     else:
@@ -268,7 +315,7 @@ def format_language(
 
 def format_annotations(
     lyrics: str,
-    annotations: List[Dict[int, str]],
+    annotations: Dict[str, str],
     include_annotations: bool,
     identifiers: Tuple[str, str] = ("!--!", "!__!"),
     format_type: str = "zip",
@@ -281,7 +328,7 @@ def format_annotations(
 
     Args:
         lyrics (str): song lyrics.
-        annotations (List[Tuple[int, str]]): Song annotations.
+        annotations (Dict[str, str]): Song annotations.
             Keys are annotation IDs that point to the annotation text.
             The annotations are found by the href attribute of <a> tags
             in the lyrics.
@@ -295,7 +342,7 @@ def format_annotations(
     """
     soup: BeautifulSoup = BeautifulSoup(lyrics, "html.parser")
     if include_annotations and annotations:
-        used = []
+        used = set()
         for a in soup.find_all("a"):
             annotation_id = a.attrs["href"]
             if annotation_id in used:
@@ -317,19 +364,18 @@ def format_annotations(
             # annotation = newline_pattern.sub('\n', annotation)
             # annotation = links_pattern.sub('', annotation)
 
-            for tag in annotation.descendants:
-                if hasattr(tag, "attrs"):
-                    for attribute, _ in list(tag.attrs.items()):
-                        if attribute != "href":
-                            tag.attrs.pop(attribute)
-                if tag.name in ("div", "script", "iframe"):
-                    tag.decompose()
-                elif tag.name == "blockquote":
-                    tag.unwrap()
+            # Nested tags come after their parents in find_all,
+            # so tags are removed in reverse to handle children first.
+            for tag in reversed(annotation.find_all(["div", "script", "iframe"])):
+                tag.decompose()
+            for tag in reversed(annotation.find_all("blockquote")):
+                tag.unwrap()
+            for tag in annotation.find_all(True):
+                tag.attrs = {"href": tag["href"]} if "href" in tag.attrs else {}
 
             a.attrs.clear()
             a.insert_after(annotation)
-            used.append(annotation_id)
+            used.add(annotation_id)
 
     return soup
 
@@ -360,7 +406,7 @@ def format_filename(string: str) -> str:
     Returns:
         str: formatted filename.
     """
-    return re.sub(r"[\\/:*?\"<>|]", "", string)
+    return INVALID_FILENAME_CHARACTERS.sub("", string)
 
 
 def get_description(entity: Dict[str, Any]) -> str:
@@ -407,7 +453,7 @@ def get_song_metadata(song: dict) -> Tuple[str, List[str], List[str]]:
     # If True, it means that this song is actually a translation.
     # So we should edit the song title and primary artist.
     # This is meant for translated songs.
-    if primary_artists[0].startswith("Genius") and featured_artists == []:
+    if primary_artists[0].startswith("Genius") and not featured_artists:
         # This regex expression removes parentheses at the end of title
         # that indicates the song is a translation
         # e.g. song - title (English Translation)
@@ -415,7 +461,9 @@ def get_song_metadata(song: dict) -> Tuple[str, List[str], List[str]]:
         # languages since the actual title itself may have parentheses and
         # it may get removed.
         title = TRANSLATION_PARENTHESES.sub("", title).strip()
-        artists, title = [x.strip() for x in title.split("-")]
+        # Only the first " - " separates the artists from the title.
+        # Artist names can have dashes themselves (e.g. Jay-Z).
+        artists, title = [x.strip() for x in title.split(" - ", 1)]
         primary_artists.clear()
         primary_artists.extend(artists.split(" & "))
     return title, primary_artists, featured_artists
@@ -455,17 +503,17 @@ def human_format(num: int) -> str:
     if num < 10000:
         return str(num)
 
-    magnitude = 0
-    while abs(num) >= 1000:
-        magnitude += 1
-        num /= 1000.0  # type: ignore
+    suffixes = ["", "K", "M", "G", "T", "P"]
+    # the number of digits gives the magnitude without float rounding
+    magnitude = min((len(str(int(num))) - 1) // 3, len(suffixes) - 1)
+    num /= 1000.0 ** magnitude  # type: ignore
 
     if num == int(num):
         formatter = "%.1d%s"
     else:
         formatter = "%.1f%s"
 
-    return formatter % (num, ["", "K", "M", "G", "T", "P"][magnitude])
+    return formatter % (num, suffixes[magnitude])
 
 
 RT = TypeVar("RT")
@@ -1,3 +1,4 @@
+from datetime import datetime, timedelta
 from io import BytesIO
 from zipfile import ZipFile
 
@@ -31,9 +32,15 @@ def test_create_zip(full_album, files):
     songs = zip_file.namelist()
 
     assert len(songs) == len(full_album["tracks"])
+    assert any(b"\r\n" in zip_file.read(file) for file in songs)
     for i, file in enumerate(songs):
+        date_time = datetime(*zip_file.getinfo(file).date_time)
+        assert abs(datetime.now() - date_time) < timedelta(minutes=5)
         with zip_file.open(file) as song:
-            lyrics = str(song.read())
+            raw_lyrics = song.read()
+            # all newlines are \r\n
+            assert raw_lyrics.count(b"\n") == raw_lyrics.count(b"\r\n")
+            lyrics = str(raw_lyrics)
             annotations_count = lyrics.count("!--!")
             if include_annotations:
                 assert annotations_count == len(
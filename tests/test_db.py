@@ -39,7 +39,11 @@ def test_get_user(update_message, context, user_data):
     func.assert_called_once_with(update, context)
 
     if user_data:
-        context.bot_data["db"].assert_not_called()
+        context.bot_data["db"].user.assert_not_called()
+    else:
+        context.bot_data["db"].user.assert_called_once_with(
+            update.effective_chat.id, context.user_data
+        )
 
 
 @pytest.mark.parametrize("chat_id", (1, 2))
@@ -129,6 +133,11 @@ def test_update_token(database, platform):
     assert getattr(user, f"{platform}_token") == new_value
 
 
+def test_update_token_invalid_platform(database):
+    with pytest.raises(ValueError):
+        database.update_token(1, "new_token", "genius_token = NULL; --")
+
+
 @pytest.mark.parametrize("platform", ("genius", "spotify"))
 def test_delete_token(database, platform):
     database.delete_token(1, platform)
@@ -51,6 +51,23 @@ def test_deep_link(download, platform):
     assert res.startswith("<a")
     assert res.endswith("</a>")
     assert name in res
+    assert username in res
+
+
+def test_deep_link_cache():
+    args = ("test_name", 1, "artist", "genius", False)
+
+    with patch("geniust.username", "first_bot"):
+        first = utils.deep_link(*args)
+        hits = utils._deep_link.cache_info().hits
+        assert utils.deep_link(*args) == first
+        assert utils._deep_link.cache_info().hits == hits + 1
+    with patch("geniust.username", "second_bot"):
+        second = utils.deep_link(*args)
+
+    assert "first_bot" in first
+    assert "second_bot" in second
+    assert first != second
 
 
 def test_remove_unsupported_tags():
@@ -64,6 +81,15 @@ def test_remove_unsupported_tags():
     assert soup.get_text().count("t") == 4
 
 
+def test_remove_unsupported_tags_nested():
+    html = "<div><p><b>t</b><img></p><span>t</span></div><u>t</u>"
+    soup = BeautifulSoup(html, "html.parser")
+
+    utils.remove_unsupported_tags(soup)
+
+    assert str(soup) == "<b>t</b>t<u>t</u>"
+
+
 def test_remove_unsupported_tags_my_tags():
     html = "<a>t</a>" "<b>t</b>" "<img>" "<u>t</u>" "<invalid>t</invalid>"
     soup = BeautifulSoup(html, "html.parser")
@@ -95,6 +121,32 @@ def test_remove_links():
     assert res == "text\ntext\ntext"
 
 
+def test_extract_lyrics_for_card():
+    html = (
+        "<p>[Verse 1]\nfirst <a href='1'>line</a> &amp; more<br/>\n"
+        "second line\n[Chorus]\n<b>third</b> line</p>"
+    )
+
+    res = utils.extract_lyrics_for_card(html)
+
+    assert res == "first line & more\nsecond line\nthird line"
+
+
+@pytest.mark.parametrize(
+    "lines, result",
+    [
+        (["I walk alone", "on the road"], "I walk alone!\non the rowd"),
+        (["not in the lyrics"], None),
+    ],
+)
+def test_find_matching_lyrics(lines, result):
+    lyrics = "I walk alone!\nsomething else\non the rowd\nmore lyrics"
+
+    res = utils.find_matching_lyrics(lines, lyrics)
+
+    assert res == result
+
+
 @pytest.mark.parametrize(
     "language", ["English", "Non-English", "English + Non-English"]
 )
@@ -144,6 +196,48 @@ def test_format_annotations(lyrics, annotations, format_type):
         assert res.get_text().count("!--!") == num_annotations
 
 
+def test_format_annotations_cleanup():
+    lyrics = '<a href="1">line</a>'
+    annotations = {
+        "1": (
+            "<div><div>nested</div></div>"
+            '<iframe src="frame"></iframe>'
+            "<script>script()</script>"
+            "<blockquote>quote</blockquote>"
+            '<a href="https://example.com" class="link">link</a>'
+            '<p style="color: red">paragraph</p>'
+        )
+    }
+
+    res = utils.format_annotations(
+        lyrics, annotations, include_annotations=True, format_type="else"
+    )
+
+    for name in ("div", "iframe", "script", "blockquote"):
+        assert res.find(name) is None
+    text = res.get_text()
+    assert "nested" not in text
+    assert "script()" not in text
+    assert "quote" in text
+    assert all(set(tag.attrs) <= {"href"} for tag in res.find_all(True))
+    assert res.find("a", href="https://example.com") is not None
+    assert res.find("p").attrs == {}
+
+
+@pytest.mark.parametrize("malformed", ["<script>unclosed", "<!--dangling"])
+def test_format_annotations_malformed(malformed):
+    lyrics = '<a href="1">first</a>\n<a href="2">second</a>'
+    annotations = {"1": malformed, "2": "second annotation"}
+
+    res = utils.format_annotations(
+        lyrics, annotations, include_annotations=True, format_type="else"
+    )
+
+    assert len(res.find_all("annotation")) == 2
+    assert "second annotation" in res.get_text()
+    assert all(not a.attrs for a in res.find_all("a"))
+
+
 @pytest.mark.parametrize(
     "artist, title", [("Genius Translation", "test_name"), ("test_artist", "test_name")]
 )
@@ -191,6 +285,42 @@ def test_format_filename(string):
             os.remove(filename)
 
 
+@pytest.mark.parametrize(
+    "song, result",
+    [
+        (
+            {
+                "title": "Song",
+                "primary_artist": {"name": "A & B"},
+                "featured_artists": [{"name": "C"}],
+            },
+            ("Song", ["A", "B"], ["C"]),
+        ),
+        (
+            {
+                "title": "A & B - Song - Live",
+                "primary_artist": {"name": "Genius Farsi Translations"},
+                "featured_artists": [],
+            },
+            ("Song - Live", ["A", "B"], []),
+        ),
+        (
+            {
+                "title": "Jay-Z - Song",
+                "primary_artist": {"name": "Genius Farsi Translations"},
+                "featured_artists": [],
+            },
+            ("Song", ["Jay-Z"], []),
+        ),
+    ],
+)
+def test_get_song_metadata(song, result):
+
+    res = utils.get_song_metadata(song)
+
+    assert res == result
+
+
 @pytest.mark.parametrize(
     "number, result",
     [
@@ -198,6 +328,8 @@ def test_format_filename(string):
         (10000, "10K"),
         (154000, "154K"),
         (2400000, "2.4M"),
+        (1000000000, "1G"),
+        (999999999999999, "1000.0T"),
     ],
 )
 def test_human_format(number, result):